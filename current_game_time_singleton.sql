@@ -0,0 +1,20 @@
+-- Adds current_game_time_singleton to an existing database without
+-- rebuilding it from schema.sql. Safe to run more than once.
+CREATE TABLE IF NOT EXISTS current_game_time_singleton (
+    id INT PRIMARY KEY DEFAULT 1 CHECK (id = 1),
+    game_time_id INT NOT NULL REFERENCES game_time(time_id)
+);
+
+-- Point the singleton at the latest recorded time, or the first time
+-- slot if none has been recorded yet
+INSERT INTO current_game_time_singleton (id, game_time_id)
+SELECT 1, COALESCE(
+    (
+        SELECT game_time_id
+        FROM current_game_time
+        ORDER BY created_at DESC, id DESC
+        LIMIT 1
+    ),
+    (SELECT MIN(time_id) FROM game_time)
+)
+ON CONFLICT (id) DO NOTHING;
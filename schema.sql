@@ -13,6 +13,7 @@ DROP TABLE IF EXISTS cart_items CASCADE;
 DROP TABLE IF EXISTS carts CASCADE;
 DROP TABLE IF EXISTS customers CASCADE;
 DROP TABLE IF EXISTS customer_visits CASCADE;
+DROP TABLE IF EXISTS current_game_time_singleton CASCADE;
 DROP TABLE IF EXISTS current_game_time CASCADE;
 DROP TABLE IF EXISTS game_time CASCADE;
 DROP TABLE IF EXISTS color_definitions CASCADE;
@@ -55,6 +56,12 @@ CREATE TABLE current_game_time (
     created_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
 );
 
+-- Latest game time, single row read by primary key
+CREATE TABLE current_game_time_singleton (
+    id INT PRIMARY KEY DEFAULT 1 CHECK (id = 1),
+    game_time_id INT NOT NULL REFERENCES game_time(time_id)
+);
+
 -- Color system
 CREATE TABLE color_definitions (
     color_id SERIAL PRIMARY KEY,
@@ -335,7 +342,6 @@ SELECT
 FROM ledger_totals;
 
 -- Indexes for common queries
-CREATE INDEX idx_game_time_day_hour ON game_time(in_game_day, in_game_hour);
 CREATE INDEX idx_barrel_visits_time ON barrel_visits(time_id);
 CREATE INDEX idx_barrel_purchases_time ON barrel_purchases(time_id);
 CREATE INDEX idx_barrel_purchases_success ON barrel_purchases(purchase_success);
@@ -346,7 +352,6 @@ CREATE INDEX idx_carts_visit_id ON carts(visit_id);
 CREATE INDEX idx_cart_items_visit_id ON cart_items(visit_id);
 CREATE INDEX idx_ledger_entries_entry_type ON ledger_entries (entry_type);
 CREATE INDEX idx_ledger_entries_gold_change ON ledger_entries (gold_change) WHERE gold_change IS NOT NULL;
-CREATE INDEX idx_strategy_time_blocks_lookup ON strategy_time_blocks(strategy_id, time_block_id, day_name);
 CREATE INDEX idx_potion_sales_time ON cart_items(time_id, potion_id);
 
 -- Populate game_time with all day/hour combinations and their references
@@ -451,6 +456,10 @@ VALUES
 (83, 'Arcanaday', 20, 2, 3),
 (84, 'Arcanaday', 22, 3, 4);
 
+-- Game starts at first tick until /info/current_time is posted
+INSERT INTO current_game_time_singleton (id, game_time_id)
+VALUES (1, (SELECT MIN(time_id) FROM game_time));
+
 -- Color Definitions - Priority order matches business logic
 INSERT INTO color_definitions 
 (color_name, priority_order) 
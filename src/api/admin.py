@@ -1,12 +1,70 @@
 import sqlalchemy
 import logging
+import threading
 from fastapi import APIRouter, Depends, HTTPException
 from src.api import auth
 from src import database as db
-from src.utilities import TimeManager, LedgerManager
 
 logger = logging.getLogger(__name__)
 
+# Serializes resets so concurrent calls don't each hold a pooled connection
+_reset_lock = threading.Lock()
+
+TRUNCATE_STATE_SQL = sqlalchemy.text("""
+    TRUNCATE TABLE
+        active_strategy,
+        current_game_time,
+        ledger_entries
+    CASCADE
+""")
+
+RESET_STATE_SQL = sqlalchemy.text("""
+    WITH reset_time AS (
+        SELECT 
+            gt.time_id,
+            gt.in_game_day,
+            gt.in_game_hour
+        FROM current_game_time_singleton cgt
+        JOIN game_time gt ON cgt.game_time_id = gt.time_id
+        WHERE cgt.id = 1
+    ),
+    reset_potions AS (
+        UPDATE potions 
+        SET current_quantity = 0 
+        WHERE current_quantity <> 0
+    ),
+    recorded_time AS (
+        INSERT INTO current_game_time (
+            game_time_id, current_day, current_hour
+        )
+        SELECT time_id, in_game_day, in_game_hour
+        FROM reset_time
+    ),
+    premium_strategy AS (
+        INSERT INTO active_strategy (strategy_id, game_time_id)
+        SELECT s.strategy_id, rt.time_id
+        FROM strategies s
+        CROSS JOIN reset_time rt
+        WHERE s.name = 'PREMIUM'
+        RETURNING game_time_id
+    )
+    INSERT INTO ledger_entries (
+        time_id,
+        entry_type,
+        gold_change,
+        ml_capacity_change,
+        potion_capacity_change
+    )
+    SELECT 
+        game_time_id,
+        'ADMIN_CHANGE',
+        100,  -- Initial gold
+        1,    -- Initial ml capacity unit
+        1     -- Initial potion capacity unit
+    FROM premium_strategy  -- No row, and no reset, if PREMIUM is missing
+    RETURNING time_id
+""")
+
 router = APIRouter(
     prefix="/admin",
     tags=["admin"],
@@ -18,62 +76,19 @@ def reset():
     """Reset the game state to initial values."""
     try:
         engine = db.get_engine()
-        with engine.begin() as conn:
-            # Get current time
-            current_time = TimeManager.get_current_time(conn)
+        with _reset_lock, engine.begin() as conn:
             logger.debug("Starting game state reset")
             
             # Clear current state
-            conn.execute(sqlalchemy.text("""
-                TRUNCATE TABLE active_strategy CASCADE;
-                TRUNCATE TABLE current_game_time CASCADE;
-                TRUNCATE TABLE ledger_entries CASCADE;
-            """))
-            
-            # Reset potion quantities
-            conn.execute(sqlalchemy.text(
-                "UPDATE potions SET current_quantity = 0"
-            ))
-            
-            # Record current time
-            conn.execute(
-                sqlalchemy.text("""
-                    INSERT INTO current_game_time (
-                        game_time_id, current_day, current_hour
-                    )
-                    VALUES (:time_id, :day, :hour)
-                """),
-                {
-                    "time_id": current_time['time_id'],
-                    "day": current_time['day'],
-                    "hour": current_time['hour']
-                }
-            )
-            
-            # Create initial gold and capacity ledger entry
-            LedgerManager.create_admin_entry(conn, current_time['time_id'])
-            
-            # Reset to PREMIUM strategy
-            premium_id = conn.execute(
-                sqlalchemy.text(
-                    "SELECT strategy_id FROM strategies WHERE name = 'PREMIUM'"
-                )
-            ).scalar_one()
+            conn.execute(TRUNCATE_STATE_SQL)
             
-            conn.execute(
-                sqlalchemy.text("""
-                    INSERT INTO active_strategy (strategy_id, game_time_id)
-                    VALUES (:strategy_id, :game_time_id)
-                """),
-                {
-                    "strategy_id": premium_id,
-                    "game_time_id": current_time['time_id']
-                }
-            )
+            # Reset potions, record current time, create initial gold and
+            # capacity ledger entry and reset to PREMIUM in one round trip
+            time_id = conn.execute(RESET_STATE_SQL).scalar_one()
             
-            logger.info("Successfully reset game state")
+            logger.info("Successfully reset game state at time_id %s", time_id)
             return {"success": True}
             
-    except Exception as e:
-        logger.error(f"Failed to reset game state: {str(e)}")
+    except Exception:
+        logger.exception("Failed to reset game state")
         raise HTTPException(status_code=500, detail="Failed to reset game state")
\ No newline at end of file
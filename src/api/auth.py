@@ -1,5 +1,6 @@
 from fastapi import Security, HTTPException, status, Request
 from fastapi.security.api_key import APIKeyHeader
+import hmac
 import os
 import dotenv
 
@@ -12,7 +13,11 @@ api_key_header = APIKeyHeader(name="access_token", auto_error=False)
 
 
 async def get_api_key(request: Request, api_key_header: str = Security(api_key_header)):
-    if api_key_header in api_keys:
+    if api_key_header and any(
+        hmac.compare_digest(api_key_header.encode(), key.encode())
+        for key in api_keys
+        if key
+    ):
         return api_key_header
     else:
         raise HTTPException(
@@ -37,7 +37,7 @@ def get_wholesale_purchase_plan(wholesale_catalog: List[Barrel]):
             catalog_dicts = [barrel.dict() for barrel in wholesale_catalog]
 
             # Log wholesale catalog
-            logger.debug(f"Wholesale catalog: {catalog_dicts}")
+            logger.debug("Wholesale catalog: %s", catalog_dicts)
             
             # Get current time
             current_time = TimeManager.get_current_time(conn)
@@ -80,7 +80,9 @@ def post_deliver_barrels(barrels_delivered: List[Barrel], order_id: int):
             # Convert Pydantic models to dicts
             barrel_dicts = [barrel.dict() for barrel in barrels_delivered]
 
-            logger.debug(f"Processing barrel delivery order {order_id}: {barrel_dicts}")
+            logger.debug(
+                "Processing barrel delivery order %s: %s", order_id, barrel_dicts
+            )
 
             # Get current time and state
             current_time = TimeManager.get_current_time(conn)
@@ -30,6 +30,8 @@ def get_bottle_plan():
                 "SELECT * FROM current_state"
             )).mappings().one()
             
+            logger.debug("Current state: %s", state)
+            
             # Get priorities and calculate plan
             priorities = BottlerManager.get_bottling_priorities(conn)
             
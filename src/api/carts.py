@@ -11,6 +11,13 @@ from src.utilities import CartManager, TimeManager
 
 logger = logging.getLogger(__name__)
 
+LATEST_VISIT_SQL = sqlalchemy.text("""
+    SELECT visit_id 
+    FROM customer_visits 
+    ORDER BY created_at DESC 
+    LIMIT 1
+""")
+
 router = APIRouter(
     prefix="/carts",
     tags=["cart"],
@@ -25,6 +32,10 @@ class Customer(BaseModel):
 class CartItem(BaseModel):
     quantity: int
 
+class CartItemSku(BaseModel):
+    sku: str
+    quantity: int
+
 class CartCheckout(BaseModel):
     payment: str
 
@@ -42,10 +53,10 @@ class search_sort_order(str, Enum):
 def post_visits(visit_id: int, customers: List[Customer]):
     """Record customers visiting the shop."""
     try:
+        customers_dicts = [customer.dict() for customer in customers]
+
         engine = db.get_engine()
         with engine.begin() as conn:
-            customers_dicts = [customer.dict() for customer in customers]
-
             current_time = TimeManager.get_current_time(conn)
             time_id = current_time['time_id']
             
@@ -56,44 +67,42 @@ def post_visits(visit_id: int, customers: List[Customer]):
                 time_id
             )
             
-            logger.info(f"Recorded visit for {len(customers)} customers")
+            logger.info("Recorded visit for %s customers", len(customers))
             return {"success": True}
             
-    except Exception as e:
-        logger.error(f"Failed to record customer visit: {str(e)}")
+    except Exception:
+        logger.exception("Failed to record customer visit")
         raise HTTPException(status_code=500, detail="Failed to record visit")
 
 @router.post("/")
 def create_cart(new_cart: Customer):
     """Create new cart for customer."""
     try:
+        customer = new_cart.dict()
+
         engine = db.get_engine()
         with engine.begin() as conn:
             current_time = TimeManager.get_current_time(conn)
             time_id = current_time['time_id']
             
             visit_id = conn.execute(
-                sqlalchemy.text("""
-                    SELECT visit_id 
-                    FROM customer_visits 
-                    ORDER BY created_at DESC 
-                    LIMIT 1
-                    """
-                )
+                LATEST_VISIT_SQL
             ).scalar_one()
             
             cart_id = CartManager.create_cart(
                 conn, 
-                new_cart.dict(), 
+                customer, 
                 time_id,
                 visit_id
             )
             
-            logger.info(f"Created cart {cart_id} for customer {new_cart.customer_name}")
+            logger.info(
+                "Created cart %s for customer %s", cart_id, new_cart.customer_name
+            )
             return {"cart_id": cart_id}
             
-    except Exception as e:
-        logger.error(f"Failed to create cart: {str(e)}")
+    except Exception:
+        logger.exception("Failed to create cart")
         raise HTTPException(status_code=500, detail="Failed to create cart")
 
 @router.post("/{cart_id}/items/{item_sku}")
@@ -103,8 +112,12 @@ def set_item_quantity(cart_id: int, item_sku: str, cart_item: CartItem):
         engine = db.get_engine()
         with engine.begin() as conn:
             cart = CartManager.validate_cart_status(conn, cart_id)
-            current_time = TimeManager.get_current_time(conn)
-            time_id = current_time['time_id']
+            if cart.get('checked_out'):
+                raise HTTPException(
+                    status_code=409,
+                    detail="Cart already checked out"
+                )
+            time_id = cart['time_id']
             
             CartManager.update_cart_item(
                 conn, 
@@ -116,17 +129,52 @@ def set_item_quantity(cart_id: int, item_sku: str, cart_item: CartItem):
             )
             
             logger.info(
-                f"Updated cart {cart_id} - item: {item_sku}, "
-                f"quantity: {cart_item.quantity}"
+                "Updated cart %s - item: %s, quantity: %s",
+                cart_id, item_sku, cart_item.quantity
             )
             return {"success": True}
             
     except HTTPException:
         raise
-    except Exception as e:
-        logger.error(f"Failed to update cart item: {str(e)}")
+    except Exception:
+        logger.exception("Failed to update cart item")
         raise HTTPException(status_code=500, detail="Failed to update item")
 
+@router.post("/{cart_id}/items")
+def set_items(cart_id: int, items: List[CartItemSku]):
+    """Add or update quantities for several items in cart."""
+    try:
+        items_dicts = [item.dict() for item in items]
+
+        engine = db.get_engine()
+        with engine.begin() as conn:
+            cart = CartManager.validate_cart_status(conn, cart_id)
+            if cart.get('checked_out'):
+                raise HTTPException(
+                    status_code=409,
+                    detail="Cart already checked out"
+                )
+            time_id = cart['time_id']
+            
+            CartManager.update_cart_items_bulk(
+                conn,
+                cart_id,
+                items_dicts,
+                time_id,
+                cart['visit_id']
+            )
+            
+            logger.info(
+                "Updated cart %s - %s items", cart_id, len(items_dicts)
+            )
+            return {"success": True}
+            
+    except HTTPException:
+        raise
+    except Exception:
+        logger.exception("Failed to update cart items")
+        raise HTTPException(status_code=500, detail="Failed to update items")
+
 @router.post("/{cart_id}/checkout")
 def checkout(cart_id: int, cart_checkout: CartCheckout):
     """Process cart checkout."""
@@ -134,8 +182,7 @@ def checkout(cart_id: int, cart_checkout: CartCheckout):
         engine = db.get_engine()
         with engine.begin() as conn:
             cart = CartManager.validate_cart_status(conn, cart_id)
-            current_time = TimeManager.get_current_time(conn)
-            time_id = current_time['time_id']
+            time_id = cart['time_id']
             
             result = CartManager.process_checkout(
                 conn,
@@ -145,16 +192,16 @@ def checkout(cart_id: int, cart_checkout: CartCheckout):
             )
             
             logger.info(
-                f"Completed checkout - cart: {cart_id}, "
-                f"total: {result['total_gold_paid']}"
+                "Completed checkout - cart: %s, total: %s",
+                cart_id, result['total_gold_paid']
             )
 
             return result
             
     except HTTPException:
         raise
-    except Exception as e:
-        logger.error(f"Failed to process checkout: {str(e)}")
+    except Exception:
+        logger.exception("Failed to process checkout")
         raise HTTPException(status_code=500, detail="Failed to checkout")
 
 @router.get("/search/", tags=["search"])
@@ -305,6 +352,6 @@ def search_orders(
     except ValueError as e:
         logger.error(f"Invalid search parameters: {str(e)}")
         raise HTTPException(status_code=400, detail=str(e))
-    except Exception as e:
-        logger.error(f"Search failed: {str(e)}")
+    except Exception:
+        logger.exception("Search failed")
         raise HTTPException(status_code=500, detail="Failed to search orders")
\ No newline at end of file
@@ -1,5 +1,7 @@
+import hashlib
 import logging
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request, Response
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
 from typing import List
 from src import database as db
@@ -16,24 +18,49 @@ class CatalogItem(BaseModel):
     price: int
     potion_type: List[int]  # [red_ml, green_ml, blue_ml, dark_ml]
 
-@router.get("/catalog/", tags=["catalog"])
-def get_catalog():
-    """Get available potions for sale, maximum 6 items."""
+def catalog_etag(items: list) -> str:
+    """Weak ETag derived from catalog contents."""
+    digest = hashlib.sha1(
+        repr([tuple(item.values()) for item in items]).encode()
+    ).hexdigest()
+    return f'W/"{digest}"'
+
+def weak_tag(tag: str) -> str:
+    """Strip the weak prefix so tags compare weakly (RFC 7232 2.3.2)."""
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+@router.get("/catalog/", tags=["catalog"], response_class=ORJSONResponse)
+def get_catalog(request: Request, response: Response):
+    """
+    Get available potions for sale, maximum 6 items.
+    Returns 304 when If-None-Match weakly matches the current ETag or
+    is "*". The catalog query still runs to compute the tag, so a 304
+    only saves building and serializing the response.
+    """
     try:
         engine = db.get_engine()
         with engine.begin() as conn:
             items = CatalogManager.get_available_potions(conn)
             
-            if items:
+            if not items:
+                logger.debug("Current catalog - no potions available")
+            elif logger.isEnabledFor(logging.DEBUG):
                 logger.debug(
                     f"Current catalog - available potions: "
                     f"{[(item['sku'], item['quantity']) for item in items]}"
                 )
-            else:
-                logger.debug("Current catalog - no potions available")
             
+            etag = catalog_etag(items)
+            if_none_match = request.headers.get("if-none-match", "")
+            tags = {weak_tag(tag) for tag in if_none_match.split(",")}
+            if "*" in tags or weak_tag(etag) in tags:
+                return Response(status_code=304, headers={"ETag": etag})
+            
+            response.headers["ETag"] = etag
+            # Rows come straight from the database, skip revalidation
             return [
-                CatalogItem(
+                CatalogItem.construct(
                     sku=item['sku'],
                     name=item['name'],
                     quantity=item['quantity'],
@@ -3,6 +3,8 @@ from fastapi.responses import JSONResponse
 from pydantic import ValidationError
 from src.api import carts, catalog, bottler, barrels, admin, info, inventory
 from src.logging_config import logging_manager
+from src import database as db
+import anyio.to_thread
 import json
 import logging
 import sys
@@ -43,6 +45,12 @@ app.include_router(barrels.router)
 app.include_router(admin.router)
 app.include_router(info.router)
 
+@app.on_event("startup")
+async def limit_threadpool():
+    """Cap sync handler threads at database pool capacity."""
+    limiter = anyio.to_thread.current_default_thread_limiter()
+    limiter.total_tokens = db.POOL_SIZE + db.MAX_OVERFLOW
+
 @app.exception_handler(exceptions.RequestValidationError)
 @app.exception_handler(ValidationError)
 async def validation_exception_handler(request, exc):
@@ -4,6 +4,12 @@ from sqlalchemy import create_engine
 
 _engine = None
 
+# Connection pool sizing for the Postgres engine
+POOL_SIZE = 20
+MAX_OVERFLOW = 10
+POOL_TIMEOUT = 30
+POOL_RECYCLE = 60
+
 def get_engine():
     global _engine
     if _engine is None:
@@ -24,7 +30,12 @@ def get_engine():
             _engine = create_engine(
                 postgres_url,
                 isolation_level="READ COMMITTED",
-                pool_pre_ping=True
+                pool_size=POOL_SIZE,
+                max_overflow=MAX_OVERFLOW,
+                pool_timeout=POOL_TIMEOUT,
+                pool_recycle=POOL_RECYCLE,
+                pool_pre_ping=True,
+                executemany_mode="values_plus_batch"
             )
             
     return _engine
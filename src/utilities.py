@@ -8,68 +8,45 @@ from typing import Dict, List
 
 logger = logging.getLogger(__name__)
 
-class LedgerManager:
-    """Handles ledger operations."""
-
-    MAX_RETRIES = 3
-    RETRY_DELAY = 0.1
-
-    @staticmethod
-    def with_retry(func):
-        """Decorator to retry database operations on failure."""
-        def wrapper(*args, **kwargs):
-            last_error = None
-            for attempt in range(LedgerManager.MAX_RETRIES):
-                try:
-                    return func(*args, **kwargs)
-                except OperationalError as e:
-                    last_error = e
-                    if attempt < LedgerManager.MAX_RETRIES - 1:
-                        logger.warning(
-                            f"Retry {attempt + 1}/{LedgerManager.MAX_RETRIES} "
-                            f"for admin operation: {str(e)}"
-                        )
-                        time.sleep(LedgerManager.RETRY_DELAY)
-                        continue
-                    logger.error(f"All retries failed: {str(last_error)}")
-                    raise
-            return None
-        return wrapper
-    
-    @classmethod
-    @with_retry
-    def create_admin_entry(cls, conn, time_id: int) -> None:
-        """Creates admin reset ledger entry with initial values."""
-        conn.execute(
-            sqlalchemy.text("""
-                INSERT INTO ledger_entries (
-                    time_id,
-                    entry_type,
-                    gold_change,
-                    ml_capacity_change,
-                    potion_capacity_change
-                ) VALUES (
-                    :time_id,
-                    'ADMIN_CHANGE',
-                    100,  -- Initial gold
-                    1,    -- Initial ml capacity unit
-                    1     -- Initial potion capacity unit
-                )
-            """),
-            {"time_id": time_id}
-        )
-        logger.info("Created admin reset ledger entry with initial values")
-
 class TimeManager:
     """Handles game time and strategy transitions."""
     
-    VALID_DAYS = {
+    VALID_DAYS = frozenset({
         'Hearthday', 'Crownday', 'Blesseday', 'Soulday',
         'Edgeday', 'Bloomday', 'Arcanaday'
-    }
+    })
     MAX_RETRIES = 3
     RETRY_DELAY = 0.1
 
+    CURRENT_TIME_SQL = sqlalchemy.text("""
+        SELECT 
+            gt.time_id,
+            gt.in_game_day as day,
+            gt.in_game_hour as hour
+        FROM current_game_time_singleton cgt
+        JOIN game_time gt ON cgt.game_time_id = gt.time_id
+        WHERE cgt.id = 1
+    """)
+
+    INSERT_TIME_HISTORY_SQL = sqlalchemy.text("""
+        INSERT INTO current_game_time (
+            game_time_id,
+            current_day,
+            current_hour
+        ) VALUES (
+            :time_id,
+            :day,
+            :hour
+        )
+    """)
+
+    UPSERT_CURRENT_TIME_SQL = sqlalchemy.text("""
+        INSERT INTO current_game_time_singleton (id, game_time_id)
+        VALUES (1, :time_id)
+        ON CONFLICT (id) DO UPDATE
+        SET game_time_id = EXCLUDED.game_time_id
+    """)
+
     @staticmethod
     def with_retry(func):
         """Decorator to retry database operations on failure."""
@@ -96,16 +73,7 @@ class TimeManager:
     def get_current_time(conn) -> dict:
         """Gets latest time_id, day, and hour."""
         result = conn.execute(
-            sqlalchemy.text("""
-                SELECT 
-                    gt.time_id,
-                    gt.in_game_day as day,
-                    gt.in_game_hour as hour
-                FROM current_game_time cgt
-                JOIN game_time gt ON cgt.game_time_id = gt.time_id
-                ORDER BY cgt.created_at DESC
-                LIMIT 1
-            """)
+            TimeManager.CURRENT_TIME_SQL
         ).mappings().first()
         
         if not result:
@@ -113,6 +81,22 @@ class TimeManager:
         
         return dict(result)
     
+    @staticmethod
+    def set_current_time(conn, time_id: int, day: str, hour: int) -> None:
+        """Appends time to history and points the singleton row at it."""
+        conn.execute(
+            TimeManager.INSERT_TIME_HISTORY_SQL,
+            {
+                "time_id": time_id,
+                "day": day,
+                "hour": hour
+            }
+        )
+        conn.execute(
+            TimeManager.UPSERT_CURRENT_TIME_SQL,
+            {"time_id": time_id}
+        )
+
     @staticmethod
     def validate_game_time(day: str, hour: int) -> bool:
         """Validates if provided day and hour are valid game time values."""
@@ -143,24 +127,7 @@ class TimeManager:
         ).scalar_one()
         
         # Record new time
-        conn.execute(
-            sqlalchemy.text("""
-                INSERT INTO current_game_time (
-                    game_time_id,
-                    current_day,
-                    current_hour
-                ) VALUES (
-                    :time_id,
-                    :day,
-                    :hour
-                )
-            """),
-            {
-                "time_id": time_id,
-                "day": day,
-                "hour": hour
-            }
-        )
+        TimeManager.set_current_time(conn, time_id, day, hour)
 
         # Get current strategy with lock
         current_strategy = conn.execute(
@@ -265,9 +232,8 @@ class CatalogManager:
                         FROM game_time
                         WHERE time_id = (
                             SELECT game_time_id 
-                            FROM current_game_time 
-                            ORDER BY created_at DESC 
-                            LIMIT 1
+                            FROM current_game_time_singleton 
+                            WHERE id = 1
                         )
                     )
                     FOR UPDATE
@@ -487,22 +453,15 @@ class BarrelManager:
         return filtered
 
     @staticmethod
-    def get_color_needs(conn, block: dict) -> dict:
-        """Calculate color needs based on future block priorities and current inventory."""
-        # Get current ml levels
-        current_levels = conn.execute(sqlalchemy.text("""
-            SELECT red_ml, green_ml, blue_ml, dark_ml
-            FROM current_state
-        """)).mappings().one()
-        
+    def get_color_needs(conn, block: dict, state: dict) -> dict:
+        """
+        Calculate color needs based on future block priorities and the
+        current_state snapshot already read by the caller.
+        """
         # Get base needs
         base_needs = conn.execute(
             sqlalchemy.text("""
-                WITH current_cap AS (
-                    SELECT potion_capacity_units * 50 as total_potion_capacity
-                    FROM current_state
-                ),
-                block_needs AS (
+                WITH block_needs AS (
                     SELECT
                         cd.color_name,
                         SUM(
@@ -511,8 +470,7 @@ class BarrelManager:
                                 WHEN cd.color_name = 'GREEN' THEN p.green_ml
                                 WHEN cd.color_name = 'BLUE' THEN p.blue_ml
                                 WHEN cd.color_name = 'DARK' THEN p.dark_ml
-                            END * bpp.sales_mix * 
-                            (SELECT total_potion_capacity FROM current_cap)
+                            END * bpp.sales_mix * :total_potion_capacity
                         ) as ml_needed
                     FROM block_potion_priorities bpp
                     JOIN potions p ON bpp.potion_id = p.potion_id
@@ -525,14 +483,17 @@ class BarrelManager:
                 WHERE ml_needed > 0
                 ORDER BY ml_needed DESC
             """),
-            {"block_id": block['block_id']}
+            {
+                "block_id": block['block_id'],
+                "total_potion_capacity": state['max_potions']
+            }
         ).mappings().all()
 
         # Calculate adjusted needs considering current inventory
         color_needs = {}
         for need in base_needs:
             color = need['color_name']
-            current = current_levels[f"{color.lower()}_ml"]
+            current = state[f"{color.lower()}_ml"]
             needed = need['ml_needed']
                 
             # Apply buffer and calculate adjusted need
@@ -557,7 +518,7 @@ class BarrelManager:
     ) -> list:
         """Plan purchases based on future needs and strategy."""
 
-        # Get current state
+        # Get current state once; current_state aggregates the whole ledger
         state = conn.execute(sqlalchemy.text(
             "SELECT * FROM current_state"
         )).mappings().one()
@@ -566,7 +527,7 @@ class BarrelManager:
         future_block = BarrelManager.get_future_block_priorities(conn, time_id)
 
         # Calculate color needs based on future block
-        color_needs = BarrelManager.get_color_needs(conn, future_block)
+        color_needs = BarrelManager.get_color_needs(conn, future_block, state)
         
         # Plan purchases considering constraints
         purchases = BarrelManager.calculate_purchase_quantities(
@@ -857,12 +818,6 @@ class BottlerManager:
         
         logger.debug(f"Getting bottling priorities for future time block")
     
-        current_state = conn.execute(
-            sqlalchemy.text("SELECT * FROM current_state")
-        ).mappings().one()
-        
-        logger.debug(f"Current state: {current_state}")
-    
         priorities = conn.execute(
             sqlalchemy.text("""
                 WITH future_info AS (
@@ -928,13 +883,14 @@ class BottlerManager:
                 f"count: {len(priorities)}"
             )
             # Log each priority for debugging
-            for p in priorities:
-                logger.debug(
-                    f"Priority: {p['sku']} - "
-                    f"sales_mix: {p['sales_mix']}, "
-                    f"current_inventory: {p['inventory']}, "
-                    f"max_per_sku: {p['max_potions_per_sku']}"
-                )
+            if logger.isEnabledFor(logging.DEBUG):
+                for p in priorities:
+                    logger.debug(
+                        f"Priority: {p['sku']} - "
+                        f"sales_mix: {p['sales_mix']}, "
+                        f"current_inventory: {p['inventory']}, "
+                        f"max_per_sku: {p['max_potions_per_sku']}"
+                    )
         else:
             logger.error("No bottling priorities found for future time block")
         
@@ -1062,8 +1018,9 @@ class BottlerManager:
         
         if result:
             logger.info(f"Bottling plan complete - total types: {len(result)}, total potions: {sum(p['quantity'] for p in result)}")
-            for plan in result:
-                logger.debug(f"Plan for {plan['sku']}: quantity={plan['quantity']}")
+            if logger.isEnabledFor(logging.DEBUG):
+                for plan in result:
+                    logger.debug(f"Plan for {plan['sku']}: quantity={plan['quantity']}")
         else:
             logger.debug("No potions can be bottled")
             
@@ -1224,6 +1181,233 @@ class CartManager:
     MAX_RETRIES = 3
     RETRY_DELAY = 0.1
 
+    INSERT_VISIT_SQL = sqlalchemy.text("""
+        WITH visit AS (
+            INSERT INTO customer_visits (visit_id, time_id, customers)
+            VALUES (:visit_id, :time_id, CAST(:customers AS jsonb))
+            RETURNING visit_record_id
+        ),
+        visit_customers AS (
+            INSERT INTO customers (
+                visit_record_id, visit_id, time_id,
+                customer_name, character_class, level
+            )
+            SELECT v.visit_record_id, :visit_id, :time_id,
+                   c.customer_name, c.character_class, c.level
+            FROM visit v
+            CROSS JOIN jsonb_to_recordset(CAST(:customers AS jsonb))
+                AS c(customer_name TEXT, character_class TEXT, level INT)
+        )
+        SELECT visit_record_id FROM visit
+    """)
+
+    FIND_CUSTOMER_SQL = sqlalchemy.text("""
+        SELECT c.customer_id
+        FROM customers c
+        JOIN customer_visits cv ON c.visit_record_id = cv.visit_record_id
+        WHERE c.customer_name = :name 
+        AND c.character_class = :class
+        AND c.level = :level
+        AND cv.visit_id = :visit_id
+        ORDER BY cv.created_at DESC
+        LIMIT 1
+    """)
+
+    INSERT_CART_SQL = sqlalchemy.text("""
+        INSERT INTO carts (
+            customer_id,
+            visit_id,
+            time_id,
+            checked_out,
+            total_potions,
+            total_gold
+        ) VALUES (
+            :customer_id,
+            :visit_id,
+            :time_id,
+            false,
+            0,
+            0
+        )
+        RETURNING cart_id
+    """)
+
+    LOCK_CART_SQL = sqlalchemy.text("""
+        SELECT 
+            c.cart_id,
+            c.visit_id,
+            c.checked_out,
+            c.total_potions,
+            c.total_gold,
+            cgt.game_time_id as time_id
+        FROM carts c
+        LEFT JOIN current_game_time_singleton cgt ON cgt.id = 1
+        WHERE c.cart_id = :cart_id
+        FOR UPDATE OF c
+    """)
+
+    PENDING_CHECKOUT_SQL = sqlalchemy.text("""
+        SELECT 
+            p.time_id,
+            EXISTS (
+                SELECT 1 
+                FROM ledger_entries le 
+                WHERE le.cart_id = :cart_id 
+                AND le.entry_type = 'POTION_SOLD'
+            ) as has_ledger
+        FROM pending_checkouts p
+        WHERE p.cart_id = :cart_id
+    """)
+
+    DELETE_PENDING_CHECKOUT_SQL = sqlalchemy.text("DELETE FROM pending_checkouts WHERE cart_id = :cart_id")
+
+    UPSERT_CART_ITEM_SQL = sqlalchemy.text("""
+        WITH potion AS (
+            SELECT 
+                potion_id,
+                current_quantity,
+                base_price
+            FROM potions
+            WHERE sku = :sku
+            FOR UPDATE
+        ),
+        upserted AS (
+            INSERT INTO cart_items (
+                cart_id,
+                visit_id,
+                potion_id,
+                time_id,
+                quantity,
+                unit_price,
+                line_total
+            )
+            SELECT
+                :cart_id,
+                :visit_id,
+                potion_id,
+                :time_id,
+                :quantity,
+                base_price,
+                base_price * :quantity
+            FROM potion
+            WHERE current_quantity >= :quantity
+            ON CONFLICT (cart_id, potion_id) 
+            DO UPDATE SET
+                quantity = EXCLUDED.quantity,
+                unit_price = EXCLUDED.unit_price,
+                line_total = EXCLUDED.line_total,
+                time_id = EXCLUDED.time_id
+        )
+        SELECT current_quantity
+        FROM potion
+    """)
+
+    LOCK_POTIONS_SQL = sqlalchemy.text("""
+        SELECT 
+            sku,
+            current_quantity
+        FROM potions
+        WHERE sku = ANY(:skus)
+        ORDER BY potion_id
+        FOR UPDATE
+    """)
+
+    UPSERT_CART_ITEMS_SQL = sqlalchemy.text("""
+        INSERT INTO cart_items (
+            cart_id,
+            visit_id,
+            potion_id,
+            time_id,
+            quantity,
+            unit_price,
+            line_total
+        )
+        SELECT
+            :cart_id,
+            :visit_id,
+            p.potion_id,
+            :time_id,
+            i.quantity,
+            p.base_price,
+            p.base_price * i.quantity
+        FROM jsonb_to_recordset(CAST(:items AS jsonb))
+            AS i(sku TEXT, quantity INT)
+        JOIN potions p ON p.sku = i.sku
+        ON CONFLICT (cart_id, potion_id) 
+        DO UPDATE SET
+            quantity = EXCLUDED.quantity,
+            unit_price = EXCLUDED.unit_price,
+            line_total = EXCLUDED.line_total,
+            time_id = EXCLUDED.time_id
+    """)
+
+    CHECKED_OUT_TOTALS_SQL = sqlalchemy.text("""
+        SELECT total_potions, total_gold
+        FROM carts
+        WHERE cart_id = :cart_id
+        AND checked_out = true
+    """)
+
+    LOCK_CART_ITEMS_SQL = sqlalchemy.text("""
+        WITH cart_lock AS (
+            SELECT cart_id, checked_out 
+            FROM carts 
+            WHERE cart_id = :cart_id
+            AND checked_out = false
+            FOR UPDATE
+        )
+        SELECT 
+            ci.potion_id,
+            ci.quantity,
+            ci.unit_price,
+            ci.line_total,
+            p.current_quantity,
+            p.sku
+        FROM cart_items ci
+        JOIN potions p ON ci.potion_id = p.potion_id
+        WHERE ci.cart_id = :cart_id
+        ORDER BY ci.potion_id
+        FOR UPDATE OF p
+    """)
+
+    DECREMENT_POTION_SQL = sqlalchemy.text("""
+        UPDATE potions
+        SET current_quantity = current_quantity - :quantity
+        WHERE potion_id = :potion_id
+    """)
+
+    INSERT_SALE_LEDGER_SQL = sqlalchemy.text("""
+        INSERT INTO ledger_entries (
+            time_id,
+            entry_type,
+            cart_id,
+            potion_id,
+            gold_change,
+            potion_change
+        ) VALUES (
+            :time_id,
+            'POTION_SOLD',
+            :cart_id,
+            :potion_id,
+            :gold_change,
+            :potion_change
+        )
+    """)
+
+    MARK_CHECKED_OUT_SQL = sqlalchemy.text("""
+        UPDATE carts
+        SET 
+            checked_out = true,
+            checked_out_at = CURRENT_TIMESTAMP,
+            payment = :payment,
+            total_potions = :total_potions,
+            total_gold = :total_gold,
+            purchase_success = true
+        WHERE cart_id = :cart_id
+        AND checked_out = false
+        RETURNING cart_id
+    """)
+
     @staticmethod
     def with_retry(func):
         """Decorator to retry database operations on failure."""
@@ -1242,13 +1426,12 @@ class CartManager:
     @classmethod
     @with_retry
     def record_customer_visit(cls, conn, visit_id: int, customers: list, time_id: int) -> int:
-        """Records customer visit with basic retry logic."""
-        visit_record_id = conn.execute(
-            sqlalchemy.text("""
-                INSERT INTO customer_visits (visit_id, time_id, customers)
-                VALUES (:visit_id, :time_id, :customers)
-                RETURNING visit_record_id
-            """),
+        """
+        Records customer visit and its customers in one statement
+        with basic retry logic.
+        """
+        return conn.execute(
+            CartManager.INSERT_VISIT_SQL,
             {
                 "visit_id": visit_id,
                 "time_id": time_id,
@@ -1256,49 +1439,11 @@ class CartManager:
             }
         ).scalar_one()
 
-        # Insert customers in a single batch
-        values = []
-        for customer in customers:
-            values.append({
-                "visit_record_id": visit_record_id,
-                "visit_id": visit_id,
-                "time_id": time_id,
-                "name": customer['customer_name'],
-                "class": customer['character_class'],
-                "level": customer['level']
-            })
-
-        if values:
-            conn.execute(
-                sqlalchemy.text("""
-                    INSERT INTO customers (
-                        visit_record_id, visit_id, time_id,
-                        customer_name, character_class, level
-                    )
-                    VALUES (:visit_record_id, :visit_id, :time_id,
-                            :name, :class, :level)
-                """),
-                values
-            )
-        
-        return visit_record_id
-
     @staticmethod
     def create_cart(conn, customer: dict, time_id: int, visit_id: int) -> int:
         """Creates new cart for customer."""
         customer_id = conn.execute(
-            sqlalchemy.text("""
-                SELECT c.customer_id
-                FROM customers c
-                JOIN customer_visits cv ON c.visit_record_id = cv.visit_record_id
-                WHERE c.customer_name = :name 
-                AND c.character_class = :class
-                AND c.level = :level
-                AND cv.visit_id = :visit_id
-                ORDER BY cv.created_at DESC
-                LIMIT 1
-                """
-            ),
+            CartManager.FIND_CUSTOMER_SQL,
             {
                 "name": customer['customer_name'],
                 "class": customer['character_class'],
@@ -1308,25 +1453,7 @@ class CartManager:
         ).scalar()
         
         return conn.execute(
-            sqlalchemy.text("""
-                INSERT INTO carts (
-                    customer_id,
-                    visit_id,
-                    time_id,
-                    checked_out,
-                    total_potions,
-                    total_gold
-                ) VALUES (
-                    :customer_id,
-                    :visit_id,
-                    :time_id,
-                    false,
-                    0,
-                    0
-                )
-                RETURNING cart_id
-                """
-            ),
+            CartManager.INSERT_CART_SQL,
             {
                 "customer_id": customer_id,
                 "visit_id": visit_id,
@@ -1336,48 +1463,35 @@ class CartManager:
 
     @staticmethod
     def validate_cart_status(conn, cart_id: int) -> dict:
-        """Validates cart exists and is not checked out with row lock."""
+        """
+        Validates cart exists and is not checked out with row lock.
+        Returned dict includes current time_id.
+        """
 
         # First check if cart was successfully checked out already
         result = conn.execute(
-            sqlalchemy.text("""
-                SELECT 
-                    c.cart_id,
-                    c.visit_id,
-                    c.checked_out,
-                    c.total_potions,
-                    c.total_gold
-                FROM carts c
-                WHERE c.cart_id = :cart_id
-                FOR UPDATE
-            """),
+            CartManager.LOCK_CART_SQL,
             {"cart_id": cart_id}
         ).mappings().first()
         
         if not result:
             raise HTTPException(status_code=404, detail="Cart not found")
         
+        if result['time_id'] is None:
+            raise HTTPException(status_code=500, detail="No current time found")
+        
         if result['checked_out']:
             # Return previous successful checkout details
             return {
+                "checked_out": True,
                 "total_potions_bought": result['total_potions'],
-                "total_gold_paid": result['total_gold']
+                "total_gold_paid": result['total_gold'],
+                "time_id": result['time_id']
             }
             
         # Check for pending checkout
         pending = conn.execute(
-            sqlalchemy.text("""
-                SELECT 
-                    p.time_id,
-                    EXISTS (
-                        SELECT 1 
-                        FROM ledger_entries le 
-                        WHERE le.cart_id = :cart_id 
-                        AND le.entry_type = 'POTION_SOLD'
-                    ) as has_ledger
-                FROM pending_checkouts p
-                WHERE p.cart_id = :cart_id
-            """),
+            CartManager.PENDING_CHECKOUT_SQL,
             {"cart_id": cart_id}
         ).mappings().first()
         
@@ -1388,7 +1502,7 @@ class CartManager:
             else:
                 # Previous attempt failed - clean up and allow retry
                 conn.execute(
-                    sqlalchemy.text("DELETE FROM pending_checkouts WHERE cart_id = :cart_id"),
+                    CartManager.DELETE_PENDING_CHECKOUT_SQL,
                     {"cart_id": cart_id}
                 )
         
@@ -1396,61 +1510,66 @@ class CartManager:
 
     @staticmethod
     def update_cart_item(conn, cart_id: int, item_sku: str, quantity: int, time_id: int, visit_id: int) -> None:
-        """Updates cart item quantity with proper locking."""
-        # Lock potion row when checking inventory
+        """Updates cart item quantity with proper locking in one statement."""
+        # Potion row is locked and the line is only written if stock covers it
         potion = conn.execute(
-            sqlalchemy.text("""
-                SELECT 
-                    potion_id,
-                    current_quantity,
-                    base_price
-                FROM potions
-                WHERE sku = :sku
-                FOR UPDATE
-            """),
-            {"sku": item_sku}
+            CartManager.UPSERT_CART_ITEM_SQL,
+            {
+                "cart_id": cart_id,
+                "visit_id": visit_id,
+                "sku": item_sku,
+                "time_id": time_id,
+                "quantity": quantity
+            }
         ).mappings().one()
         
         if potion['current_quantity'] < quantity:
             raise HTTPException(status_code=400, detail="Insufficient quantity")
-        
-        line_total = potion['base_price'] * quantity
-        
-        # Lock cart_items row
-        conn.execute(
-            sqlalchemy.text("""
-                INSERT INTO cart_items (
-                    cart_id,
-                    visit_id,
-                    potion_id,
-                    time_id,
-                    quantity,
-                    unit_price,
-                    line_total
-                ) VALUES (
-                    :cart_id,
-                    :visit_id,
-                    :potion_id,
-                    :time_id,
-                    :quantity,
-                    :price,
-                    :line_total
+
+    @staticmethod
+    def collapse_cart_items(items: list) -> dict:
+        """Maps sku to quantity, last quantity wins when a sku is repeated."""
+        return {item['sku']: item['quantity'] for item in items}
+
+    @staticmethod
+    def check_item_stock(quantities: dict, available: dict) -> None:
+        """Raises 400 for unknown skus or quantities beyond available stock."""
+        for sku, quantity in quantities.items():
+            if sku not in available:
+                raise HTTPException(status_code=400, detail=f"Unknown sku {sku}")
+            if available[sku] < quantity:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Insufficient quantity for {sku}"
                 )
-                ON CONFLICT (cart_id, potion_id) 
-                DO UPDATE SET
-                    quantity = :quantity,
-                    unit_price = :price,
-                    line_total = :line_total,
-                    time_id = :time_id
-                """),
+
+    @staticmethod
+    def update_cart_items_bulk(conn, cart_id: int, items: list, time_id: int, visit_id: int) -> None:
+        """Sets quantities for several cart items in one upsert."""
+        quantities = CartManager.collapse_cart_items(items)
+        if not quantities:
+            return
+
+        # Lock all requested potion rows when checking inventory
+        potions = conn.execute(
+            CartManager.LOCK_POTIONS_SQL,
+            {"skus": list(quantities)}
+        ).mappings().all()
+        CartManager.check_item_stock(
+            quantities,
+            {p['sku']: p['current_quantity'] for p in potions}
+        )
+
+        conn.execute(
+            CartManager.UPSERT_CART_ITEMS_SQL,
             {
                 "cart_id": cart_id,
                 "visit_id": visit_id,
-                "potion_id": potion['potion_id'],
                 "time_id": time_id,
-                "quantity": quantity,
-                "price": potion['base_price'],
-                "line_total": line_total
+                "items": json.dumps([
+                    {"sku": sku, "quantity": quantity}
+                    for sku, quantity in quantities.items()
+                ])
             }
         )
 
@@ -1460,12 +1579,7 @@ class CartManager:
         """Process cart checkout with retry logic and basic concurrency handling."""
         # Check if this cart was already processed
         existing_checkout = conn.execute(
-            sqlalchemy.text("""
-                SELECT total_potions, total_gold
-                FROM carts
-                WHERE cart_id = :cart_id
-                AND checked_out = true
-            """),
+            CartManager.CHECKED_OUT_TOTALS_SQL,
             {"cart_id": cart_id}
         ).mappings().first()
 
@@ -1478,27 +1592,7 @@ class CartManager:
 
         # Lock cart and items in one query
         cart_items = conn.execute(
-            sqlalchemy.text("""
-                WITH cart_lock AS (
-                    SELECT cart_id, checked_out 
-                    FROM carts 
-                    WHERE cart_id = :cart_id
-                    AND checked_out = false
-                    FOR UPDATE
-                )
-                SELECT 
-                    ci.potion_id,
-                    ci.quantity,
-                    ci.unit_price,
-                    ci.line_total,
-                    p.current_quantity,
-                    p.sku
-                FROM cart_items ci
-                JOIN potions p ON ci.potion_id = p.potion_id
-                WHERE ci.cart_id = :cart_id
-                ORDER BY ci.potion_id
-                FOR UPDATE OF p
-            """),
+            CartManager.LOCK_CART_ITEMS_SQL,
             {"cart_id": cart_id}
         ).mappings().all()
 
@@ -1521,11 +1615,7 @@ class CartManager:
         for item in cart_items:
             # Update potion inventory
             conn.execute(
-                sqlalchemy.text("""
-                    UPDATE potions
-                    SET current_quantity = current_quantity - :quantity
-                    WHERE potion_id = :potion_id
-                """),
+                CartManager.DECREMENT_POTION_SQL,
                 {
                     "quantity": item['quantity'],
                     "potion_id": item['potion_id']
@@ -1534,23 +1624,7 @@ class CartManager:
 
             # Create ledger entry
             conn.execute(
-                sqlalchemy.text("""
-                    INSERT INTO ledger_entries (
-                        time_id,
-                        entry_type,
-                        cart_id,
-                        potion_id,
-                        gold_change,
-                        potion_change
-                    ) VALUES (
-                        :time_id,
-                        'POTION_SOLD',
-                        :cart_id,
-                        :potion_id,
-                        :gold_change,
-                        :potion_change
-                    )
-                """),
+                CartManager.INSERT_SALE_LEDGER_SQL,
                 {
                     "time_id": time_id,
                     "cart_id": cart_id,
@@ -1562,19 +1636,7 @@ class CartManager:
 
         # Mark cart as checked out 
         rows_updated = conn.execute(
-            sqlalchemy.text("""
-                UPDATE carts
-                SET 
-                    checked_out = true,
-                    checked_out_at = CURRENT_TIMESTAMP,
-                    payment = :payment,
-                    total_potions = :total_potions,
-                    total_gold = :total_gold,
-                    purchase_success = true
-                WHERE cart_id = :cart_id
-                AND checked_out = false
-                RETURNING cart_id
-            """),
+            CartManager.MARK_CHECKED_OUT_SQL,
             {
                 "payment": payment,
                 "total_potions": total_potions,
@@ -1586,12 +1648,7 @@ class CartManager:
         if rows_updated == 0:
             # Cart might have been processed in parallel, get its results
             result = conn.execute(
-                sqlalchemy.text("""
-                    SELECT total_potions, total_gold 
-                    FROM carts 
-                    WHERE cart_id = :cart_id
-                    AND checked_out = true
-                """),
+                CartManager.CHECKED_OUT_TOTALS_SQL,
                 {"cart_id": cart_id}
             ).mappings().first()
 
@@ -282,6 +282,7 @@ def setup_test_db(engine):
             'strategy_transitions',
             'potions',
             'strategies',
+            'current_game_time_singleton',
             'current_game_time',
             'game_time',
             'color_definitions',
@@ -0,0 +1,49 @@
+import pytest
+from fastapi import HTTPException
+from src.api import auth
+
+class TestApiKey:
+    """Test API key dependency"""
+
+    @pytest.fixture(autouse=True)
+    def setup(self, test_logger, monkeypatch):
+        """Replace configured keys with a known test key"""
+        monkeypatch.setattr(auth, "api_keys", ["test_api_key"])
+        self.logger = test_logger
+
+        yield
+
+    @pytest.mark.asyncio
+    async def test_correct_key(self):
+        """Test matching key is accepted and returned"""
+        key = await auth.get_api_key(None, "test_api_key")
+
+        assert key == "test_api_key"
+
+    @pytest.mark.asyncio
+    async def test_wrong_key(self):
+        """Test non-matching key is rejected"""
+        with pytest.raises(HTTPException) as exc_info:
+            await auth.get_api_key(None, "wrong_key")
+
+        assert exc_info.value.status_code == 401
+        assert exc_info.value.detail == "Forbidden"
+
+    @pytest.mark.asyncio
+    async def test_missing_header(self):
+        """Test request without access_token header is rejected"""
+        with pytest.raises(HTTPException) as exc_info:
+            await auth.get_api_key(None, None)
+
+        assert exc_info.value.status_code == 401
+
+    @pytest.mark.asyncio
+    async def test_unset_api_key(self, monkeypatch):
+        """Test unset API_KEY entry never matches"""
+        monkeypatch.setattr(auth, "api_keys", [None])
+
+        for header in (None, "", "None"):
+            with pytest.raises(HTTPException) as exc_info:
+                await auth.get_api_key(None, header)
+
+            assert exc_info.value.status_code == 401
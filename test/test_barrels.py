@@ -5,8 +5,17 @@ from fastapi.testclient import TestClient
 from src.api.server import app
 from src.api.barrels import Barrel, BarrelPurchase
 from src.api.auth import api_keys
+from src.utilities import TimeManager
 from test.sqlite_setup import create_test_db
 
+def set_game_time(conn, day: str, hour: int):
+    """Record game time in both the history and singleton tables."""
+    time_id = conn.execute(sqlalchemy.text("""
+        SELECT time_id FROM game_time
+        WHERE in_game_day = :day AND in_game_hour = :hour
+    """), {"day": day, "hour": hour}).scalar_one()
+    TimeManager.set_current_time(conn, time_id, day, hour)
+
 class TestBarrelDiagnostic:
     """Diagnostic tests for barrel system failures"""
     
@@ -176,9 +185,7 @@ class TestBarrels:
         self.headers = {"access_token": test_api_key}
 
         with self.engine.begin() as conn:
-            conn.execute(sqlalchemy.text(
-                "INSERT INTO current_game_time (game_time_id, current_day, current_hour) VALUES (1, 'Hearthday', 0)"
-            ))
+            set_game_time(conn, 'Hearthday', 0)
         
         yield
         
@@ -247,15 +254,7 @@ class TestBarrels:
     def set_game_time(self, day: str, hour: int):
         """Helper to set game time"""
         with self.engine.begin() as conn:
-            conn.execute(sqlalchemy.text("""
-                INSERT INTO current_game_time (game_time_id, current_day, current_hour)
-                VALUES (
-                    (SELECT time_id FROM game_time 
-                    WHERE in_game_day = :day AND in_game_hour = :hour),
-                    :day,
-                    :hour
-                );
-            """), {"day": day, "hour": hour})
+            set_game_time(conn, day, hour)
 
     def test_premium_barrel_strategy(self):
         """Test PREMIUM strategy barrel purchasing rules"""
@@ -388,15 +387,7 @@ class TestBarrels:
             """))
             
             # Set game time to evening
-            conn.execute(sqlalchemy.text("""
-                INSERT INTO current_game_time (game_time_id, current_day, current_hour)
-                VALUES (
-                    (SELECT time_id FROM game_time 
-                     WHERE in_game_day = :day AND in_game_hour = 22),
-                    :day,
-                    22
-                );
-            """), {"day": special_day})
+            set_game_time(conn, special_day, 22)
         
         # Create test catalog with dark and regular barrels
         catalog = [
@@ -634,15 +625,7 @@ class TestBarrels:
             
             # Setup evening time (22:00)
             with self.engine.begin() as conn:
-                conn.execute(sqlalchemy.text("""
-                    INSERT INTO current_game_time (game_time_id, current_day, current_hour)
-                    VALUES (
-                        (SELECT time_id FROM game_time 
-                        WHERE in_game_day = :day AND in_game_hour = 22),
-                        :day,
-                        22
-                    );
-                """), {"day": day})
+                set_game_time(conn, day, 22)
             
             catalog = [
                 self.create_test_barrel('LARGE', 'DARK')
@@ -800,15 +783,7 @@ class TestBarrels:
         # Test 4: Can purchase DARK barrels on special days
         with self.engine.begin() as conn:
             # Set time to Hearthday evening
-            conn.execute(sqlalchemy.text("""
-                INSERT INTO current_game_time (game_time_id, current_day, current_hour)
-                VALUES (
-                    (SELECT time_id FROM game_time 
-                    WHERE in_game_day = 'Hearthday' AND in_game_hour = 22),
-                    'Hearthday',
-                    22
-                );
-            """))
+            set_game_time(conn, 'Hearthday', 22)
         
         dark_catalog = [
             self.create_test_barrel('LARGE', 'DARK', quantity=2),
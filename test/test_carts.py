@@ -0,0 +1,255 @@
+import json
+import pytest
+from contextlib import contextmanager
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+from src import database as db
+from src.api.server import app
+from src.api.auth import api_keys
+from src.utilities import CartManager
+
+POTIONS = [
+    {'sku': 'RED', 'current_quantity': 10},
+    {'sku': 'GREEN', 'current_quantity': 5}
+]
+
+OPEN_CART = {
+    'cart_id': 1,
+    'visit_id': 7,
+    'checked_out': False,
+    'time_id': 3
+}
+
+class StubResult:
+    """Result stand-in returning fixed rows."""
+
+    def __init__(self, rows):
+        self.rows = rows
+
+    def mappings(self):
+        return self
+
+    def all(self):
+        return self.rows
+
+class StubConnection:
+    """Connection stand-in that records executed statements."""
+
+    def __init__(self, potions):
+        self.potions = potions
+        self.executed = []
+
+    def execute(self, statement, parameters=None):
+        self.executed.append((statement, parameters))
+        if statement is CartManager.LOCK_POTIONS_SQL:
+            return StubResult([
+                p for p in self.potions if p['sku'] in parameters['skus']
+            ])
+        return StubResult([])
+
+    def statements(self):
+        return [statement for statement, _ in self.executed]
+
+class StubEngine:
+    """Engine stand-in tracking whether its transaction committed."""
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.committed = False
+        self.rolled_back = False
+
+    @contextmanager
+    def begin(self):
+        try:
+            yield self.conn
+        except Exception:
+            self.rolled_back = True
+            raise
+        self.committed = True
+
+class TestCartItemStock:
+    """Test sku collapsing and stock checks for batched cart items"""
+
+    def test_collapse_last_quantity_wins(self):
+        """Test repeated skus keep their last quantity in first-seen order"""
+        quantities = CartManager.collapse_cart_items([
+            {"sku": "GREEN", "quantity": 2},
+            {"sku": "RED", "quantity": 1},
+            {"sku": "GREEN", "quantity": 4}
+        ])
+
+        assert quantities == {"GREEN": 4, "RED": 1}
+        assert list(quantities) == ["GREEN", "RED"]
+
+    def test_collapse_empty(self):
+        """Test empty item list collapses to nothing"""
+        assert CartManager.collapse_cart_items([]) == {}
+
+    def test_stock_sufficient(self):
+        """Test quantities up to available stock pass"""
+        CartManager.check_item_stock({"RED": 10, "GREEN": 1}, {"RED": 10, "GREEN": 5})
+
+    def test_stock_unknown_sku(self):
+        """Test sku missing from available stock is rejected"""
+        with pytest.raises(HTTPException) as exc_info:
+            CartManager.check_item_stock({"RED": 1, "NOPE": 1}, {"RED": 10})
+
+        assert exc_info.value.status_code == 400
+        assert exc_info.value.detail == "Unknown sku NOPE"
+
+    def test_stock_insufficient(self):
+        """Test quantity beyond available stock is rejected"""
+        with pytest.raises(HTTPException) as exc_info:
+            CartManager.check_item_stock({"RED": 2, "GREEN": 6}, {"RED": 10, "GREEN": 5})
+
+        assert exc_info.value.status_code == 400
+        assert exc_info.value.detail == "Insufficient quantity for GREEN"
+
+class TestSetCartItems:
+    """
+    Route-level tests for cart item endpoints. SQL execution is stubbed,
+    so LOCK_POTIONS_SQL and UPSERT_CART_ITEMS_SQL are not run here; they
+    need Postgres for ANY, jsonb_to_recordset and ON CONFLICT.
+    """
+
+    @pytest.fixture(autouse=True)
+    def setup(self, test_logger, monkeypatch):
+        """Stub database access so the route runs without Postgres"""
+        self.conn = StubConnection(POTIONS)
+        self.engine = StubEngine(self.conn)
+        self.cart = dict(OPEN_CART)
+        monkeypatch.setattr(db, "get_engine", lambda: self.engine)
+        monkeypatch.setattr(
+            CartManager,
+            "validate_cart_status",
+            staticmethod(lambda conn, cart_id: self.cart)
+        )
+        self.client = TestClient(app)
+        self.logger = test_logger
+
+        # Setup auth
+        test_api_key = "test_api_key"
+        api_keys.append(test_api_key)
+        self.headers = {"access_token": test_api_key}
+
+        yield
+
+        if test_api_key in api_keys:
+            api_keys.remove(test_api_key)
+
+    def set_items(self, items: list):
+        """Helper to post items to the test cart"""
+        response = self.client.post(
+            "/carts/1/items",
+            json=items,
+            headers=self.headers
+        )
+        self.logger.info(f"Set items response: {response.json()}")
+        return response
+
+    def test_set_items(self):
+        """Test items are upserted in one statement"""
+        response = self.set_items([
+            {"sku": "RED", "quantity": 2},
+            {"sku": "GREEN", "quantity": 5}
+        ])
+
+        assert response.status_code == 200
+        assert response.json() == {"success": True}
+        assert self.conn.statements() == [
+            CartManager.LOCK_POTIONS_SQL,
+            CartManager.UPSERT_CART_ITEMS_SQL
+        ]
+
+        params = self.conn.executed[1][1]
+        assert params["cart_id"] == 1
+        assert params["visit_id"] == OPEN_CART['visit_id']
+        assert params["time_id"] == OPEN_CART['time_id']
+        assert json.loads(params["items"]) == [
+            {"sku": "RED", "quantity": 2},
+            {"sku": "GREEN", "quantity": 5}
+        ]
+        assert self.engine.committed
+
+    def test_duplicate_sku_last_quantity_wins(self):
+        """Test repeated skus collapse to their last quantity"""
+        response = self.set_items([
+            {"sku": "GREEN", "quantity": 2},
+            {"sku": "RED", "quantity": 1},
+            {"sku": "GREEN", "quantity": 4}
+        ])
+
+        assert response.status_code == 200
+        assert self.conn.executed[0][1] == {"skus": ["GREEN", "RED"]}
+        assert json.loads(self.conn.executed[1][1]["items"]) == [
+            {"sku": "GREEN", "quantity": 4},
+            {"sku": "RED", "quantity": 1}
+        ]
+
+    def test_unknown_sku(self):
+        """Test unknown sku is rejected before any write"""
+        response = self.set_items([
+            {"sku": "RED", "quantity": 1},
+            {"sku": "NOPE", "quantity": 1}
+        ])
+
+        assert response.status_code == 400
+        assert response.json()["detail"] == "Unknown sku NOPE"
+        assert CartManager.UPSERT_CART_ITEMS_SQL not in self.conn.statements()
+        assert self.engine.rolled_back
+
+    def test_insufficient_quantity(self):
+        """Test short stock is rejected and the transaction rolled back"""
+        response = self.set_items([
+            {"sku": "RED", "quantity": 2},
+            {"sku": "GREEN", "quantity": 6}
+        ])
+
+        assert response.status_code == 400
+        assert response.json()["detail"] == "Insufficient quantity for GREEN"
+        assert CartManager.UPSERT_CART_ITEMS_SQL not in self.conn.statements()
+        assert self.engine.rolled_back
+        assert not self.engine.committed
+
+    def test_empty_items(self):
+        """Test empty list succeeds without touching the database"""
+        response = self.set_items([])
+
+        assert response.status_code == 200
+        assert response.json() == {"success": True}
+        assert self.conn.executed == []
+
+    def test_checked_out_cart(self):
+        """Test checked out cart returns 409 instead of failing"""
+        self.cart = {
+            "checked_out": True,
+            "total_potions_bought": 2,
+            "total_gold_paid": 100,
+            "time_id": 3
+        }
+
+        response = self.set_items([{"sku": "RED", "quantity": 1}])
+
+        assert response.status_code == 409
+        assert response.json()["detail"] == "Cart already checked out"
+        assert self.conn.executed == []
+        assert self.engine.rolled_back
+
+    def test_set_item_quantity_checked_out_cart(self):
+        """Test single item endpoint also returns 409 for checked out cart"""
+        self.cart = {
+            "checked_out": True,
+            "total_potions_bought": 2,
+            "total_gold_paid": 100,
+            "time_id": 3
+        }
+
+        response = self.client.post(
+            "/carts/1/items/RED",
+            json={"quantity": 1},
+            headers=self.headers
+        )
+
+        assert response.status_code == 409
+        assert response.json()["detail"] == "Cart already checked out"
+        assert self.conn.executed == []
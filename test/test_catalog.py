@@ -0,0 +1,108 @@
+import pytest
+from contextlib import nullcontext
+from fastapi.testclient import TestClient
+from src import database as db
+from src.api import catalog
+from src.api.server import app
+from src.utilities import CatalogManager
+
+CATALOG_ROWS = [
+    {
+        'sku': 'RED',
+        'name': 'Red',
+        'quantity': 10,
+        'price': 50,
+        'potion_type': [100, 0, 0, 0]
+    },
+    {
+        'sku': 'GREEN',
+        'name': 'Green',
+        'quantity': 5,
+        'price': 50,
+        'potion_type': [0, 100, 0, 0]
+    }
+]
+
+class StubEngine:
+    """Engine stand-in whose transactions do nothing."""
+
+    def begin(self):
+        return nullcontext()
+
+class TestCatalog:
+    """Test catalog endpoint ETag handling"""
+
+    @pytest.fixture(autouse=True)
+    def setup(self, test_logger, monkeypatch):
+        """Stub database access so the route runs without Postgres"""
+        self.rows = [dict(row) for row in CATALOG_ROWS]
+        monkeypatch.setattr(db, "get_engine", lambda: StubEngine())
+        monkeypatch.setattr(
+            CatalogManager,
+            "get_available_potions",
+            staticmethod(lambda conn: self.rows)
+        )
+        self.client = TestClient(app)
+        self.logger = test_logger
+
+        yield
+
+    def test_catalog_returns_items_with_etag(self):
+        """Test 200 response carries the catalog and its ETag"""
+        response = self.client.get("/catalog/")
+        self.logger.info(f"Catalog response: {response.json()}")
+
+        assert response.status_code == 200
+        assert response.json() == CATALOG_ROWS
+        assert response.headers["ETag"] == catalog.catalog_etag(CATALOG_ROWS)
+        assert response.headers["ETag"].startswith('W/"')
+
+    def test_catalog_not_modified(self):
+        """Test matching If-None-Match returns an empty 304"""
+        etag = self.client.get("/catalog/").headers["ETag"]
+
+        response = self.client.get("/catalog/", headers={"If-None-Match": etag})
+
+        assert response.status_code == 304
+        assert response.headers["ETag"] == etag
+        assert response.content == b""
+
+    def test_catalog_etag_in_list(self):
+        """Test ETag is matched inside a comma-separated If-None-Match"""
+        etag = self.client.get("/catalog/").headers["ETag"]
+
+        response = self.client.get(
+            "/catalog/",
+            headers={"If-None-Match": f'W/"stale", {etag} , "other"'}
+        )
+
+        assert response.status_code == 304
+
+    def test_catalog_etag_without_weak_prefix(self):
+        """Test If-None-Match uses weak comparison"""
+        etag = self.client.get("/catalog/").headers["ETag"]
+        strong = etag[2:]
+
+        response = self.client.get("/catalog/", headers={"If-None-Match": strong})
+
+        assert strong.startswith('"')
+        assert response.status_code == 304
+        assert response.headers["ETag"] == etag
+
+    def test_catalog_wildcard(self):
+        """Test If-None-Match: * returns 304"""
+        response = self.client.get("/catalog/", headers={"If-None-Match": "*"})
+
+        assert response.status_code == 304
+        assert response.headers["ETag"] == catalog.catalog_etag(CATALOG_ROWS)
+
+    def test_catalog_changed(self):
+        """Test stale ETag gets a fresh 200 once stock changes"""
+        etag = self.client.get("/catalog/").headers["ETag"]
+        self.rows[0]['quantity'] = 9
+
+        response = self.client.get("/catalog/", headers={"If-None-Match": etag})
+
+        assert response.status_code == 200
+        assert response.headers["ETag"] != etag
+        assert response.json()[0]['quantity'] == 9
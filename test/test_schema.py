@@ -2,6 +2,7 @@ import pytest
 import sqlalchemy
 import logging
 from pathlib import Path
+from src.utilities import TimeManager
 from test.sqlite_setup import create_test_db
 
 class TestSchema:
@@ -31,7 +32,8 @@ class TestSchema:
                 'active_strategy', 'barrel_details', 'barrel_purchases',
                 'barrel_visits', 'block_potion_priorities',
                 'capacity_upgrade_thresholds', 'cart_items', 'carts',
-                'color_definitions', 'current_game_time', 'customer_visits',
+                'color_definitions', 'current_game_time',
+                'current_game_time_singleton', 'customer_visits',
                 'customers', 'game_time', 'ledger_entries', 'potions',
                 'strategies', 'strategy_time_blocks', 'strategy_transitions',
                 'time_blocks'
@@ -162,6 +164,53 @@ class TestSchema:
                 assert ref['bottling_time_id'] is not None, "Missing bottling reference"
                 assert ref['barrel_time_id'] is not None, "Missing barrel reference"
     
+    def test_current_game_time_singleton(self):
+        """Test current time is written to and read from the singleton row"""
+        self.logger.info("Testing current game time singleton")
+        
+        with self.engine.begin() as conn:
+            # Seed row points at the first time slot
+            current = TimeManager.get_current_time(conn)
+            assert current == {'time_id': 1, 'day': 'Hearthday', 'hour': 0}
+            
+            TimeManager.set_current_time(conn, 15, 'Crownday', 4)
+            
+            current = TimeManager.get_current_time(conn)
+            self.logger.info(f"Current time after update: {current}")
+            assert current == {'time_id': 15, 'day': 'Crownday', 'hour': 4}
+            
+            rows = conn.execute(sqlalchemy.text("""
+                SELECT COUNT(*) FROM current_game_time_singleton
+            """)).scalar_one()
+            assert rows == 1, "Singleton should hold exactly one row"
+            
+            history = conn.execute(sqlalchemy.text("""
+                SELECT game_time_id, current_day, current_hour
+                FROM current_game_time
+                ORDER BY id DESC
+                LIMIT 1
+            """)).mappings().one()
+            assert dict(history) == {
+                'game_time_id': 15, 'current_day': 'Crownday', 'current_hour': 4
+            }
+            
+            # Missing seed row is recreated rather than silently skipped
+            conn.execute(sqlalchemy.text(
+                "DELETE FROM current_game_time_singleton"
+            ))
+            TimeManager.set_current_time(conn, 16, 'Crownday', 6)
+            
+            current = TimeManager.get_current_time(conn)
+            assert current == {'time_id': 16, 'day': 'Crownday', 'hour': 6}
+            
+            # Only one singleton row is allowed
+            with pytest.raises(sqlalchemy.exc.IntegrityError):
+                with conn.begin_nested():
+                    conn.execute(sqlalchemy.text("""
+                        INSERT INTO current_game_time_singleton (id, game_time_id)
+                        VALUES (2, 1)
+                    """))
+    
     def test_constraints(self):
         """Test table constraints and validations"""
         self.logger.info("Testing database constraints")